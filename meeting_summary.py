@@ -3,8 +3,8 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 import asyncio
+import io
 import re
-from contextlib import suppress
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Type, cast
@@ -13,7 +13,7 @@ from urllib.parse import urlparse
 from aiohttp.web import HTTPError
 from cashews import cache
 from google import genai
-from google.genai.types import GenerateContentResponse, Part
+from google.genai.types import UploadFileConfig
 from maubot import MessageEvent, Plugin  # type: ignore
 from maubot.handlers import event
 from mautrix import errors
@@ -45,6 +45,26 @@ Does it look correct to you? If so, please click on ✅, otherwise please click
 
 (*this bot feature is in alpha stage, thanks for your patience*)
 """
+# Split the template once so that responses are built without str.format().
+# The template must contain exactly one {members} followed by one {summary}.
+_RESPONSE_PREFIX, _members, _rest = RESPONSE_TEMPLATE.partition("{members}")
+_RESPONSE_MIDDLE, _summary, _RESPONSE_SUFFIX = _rest.partition("{summary}")
+assert _members and _summary and "{" not in _RESPONSE_SUFFIX, (
+    "RESPONSE_TEMPLATE must contain {members} followed by {summary}"
+)
+
+
+def _compile_username_re(ignored_ids: frozenset[str]) -> re.Pattern[bytes]:
+    """Compile the regex matching the speakers of a meeting log.
+
+    The ignored ids are excluded with a negative lookahead so that they are never
+    captured.
+    """
+    excluded = b"|".join(re.escape(i.encode("utf-8")) for i in sorted(ignored_ids))
+    return re.compile(
+        rb"^\d{4}-\d\d-\d\d \d\d:\d\d:\d\d <(?!(?:" + excluded + rb")>)(@[^>]+?)> ",
+        re.MULTILINE,
+    )
 
 
 class MeetingLogFetchingError(Exception):
@@ -80,9 +100,34 @@ class MeetingSummary(Plugin):
             api_key=self.config["gemini"]["api_key"],
         )
         cache.setup("mem://")  # In-memory cache
+        self._load_config()
+
+    def on_external_config_update(self) -> None:
+        super().on_external_config_update()
+        self._load_config()
+
+    def _load_config(self) -> None:
+        # Keep the config values used when handling events as attributes, they are
+        # reloaded along with the config.
+        self._model: str = self.config["gemini"]["model"]
+        self._meetbot_id: str = self.config["meetbot_id"]
+        self._meetings_dir: Path | None = (
+            Path(self.config["meetings_directory"])
+            if self.config["meetings_directory"]
+            else None
+        )
+        ignored_ids = frozenset(
+            [
+                self.client.mxid,
+                self._meetbot_id,
+                *self.config["ignored_participants"],
+            ]
+        )
+        self._username_re = _compile_username_re(ignored_ids)
 
     async def stop(self) -> None:
-        pass
+        # Close the HTTP session that the async Gemini client keeps alive
+        await self.gemini.aio.aclose()
 
     @classmethod
     def get_config_class(cls) -> Type[BaseProxyConfig]:
@@ -90,15 +135,14 @@ class MeetingSummary(Plugin):
 
     @event.on(EventType.ROOM_MESSAGE)  # type: ignore
     async def on_message(self, evt: MessageEvent) -> None:
-        room_alias = await self._get_room_alias(evt.room_id)
         if evt.content.msgtype != MessageType.NOTICE:
             # self.log.debug(
-            #     f"Ignoring message of type {evt.content.msgtype} from {evt.sender} in {room_alias or evt.room_id}"
+            #     f"Ignoring message of type {evt.content.msgtype} from {evt.sender} in {evt.room_id}"
             # )
             return
-        if evt.sender != self.config["meetbot_id"]:
+        if evt.sender != self._meetbot_id:
             self.log.debug(
-                f"Ignoring message from {evt.sender} in {room_alias or evt.room_id}, I'm only listening to {self.config['meetbot_id']}"
+                f"Ignoring message from {evt.sender} in {evt.room_id}, I'm only listening to {self._meetbot_id}"
             )
             return
 
@@ -110,6 +154,7 @@ class MeetingSummary(Plugin):
             return
 
         url = message_body[len(MEETBOT_PREFIX) :]
+        room_alias = await self._get_room_alias(evt.room_id)
         room_name = str(room_alias or evt.room_id)
         if room_name != evt.room_id:
             room_name = f"{room_name} ({evt.room_id})"
@@ -176,15 +221,19 @@ class MeetingSummary(Plugin):
         except MeetingLogFetchingError as e:
             await evt.reply(str(e))
             return
-        # Extract Matrix usernames from the meeting log
-        usernames = self.extract_usernames(meeting_log)
-        # Ask AI to give a summary of the meeting
-        summary = await self.get_summary(meeting_log)
+        loop = asyncio.get_running_loop()
+        usernames, summary = await asyncio.gather(
+            # Extract Matrix usernames from the meeting log
+            loop.run_in_executor(None, self.extract_usernames, meeting_log),
+            # Ask AI to give a summary of the meeting
+            self.get_summary(meeting_log),
+        )
         await self.post_summary(evt, summary, usernames, url)
         # Inform that we're done
         # await self.client.redact(evt.room_id, reaction_event_id, reason="done.")
         await self.client.set_typing(evt.room_id, timeout=0)
 
+    @cache(ttl="5m", key="room_alias:{room_id}")
     async def _get_room_alias(self, room_id: RoomID) -> RoomAlias | None:
         try:
             content = cast(
@@ -198,13 +247,13 @@ class MeetingSummary(Plugin):
             return None
         return content.canonical_alias
 
-    async def get_meeting_log(self, evt: MessageEvent, url: str) -> str:
+    async def get_meeting_log(self, evt: MessageEvent, url: str) -> bytes:
         self.log.debug(f"Processing meeting log from URL: {url} in room {evt.room_id}")
 
         try:
             async with self.http.get(url) as response:
                 response.raise_for_status()
-                doc_data = await response.text()
+                doc_data = await response.read()
         except HTTPError as e:
             self.log.exception(f"Failed to fetch meeting log from {url}: {e}")
             raise MeetingLogFetchingError(f"❌ Failed to fetch meeting log: {e}")
@@ -212,46 +261,47 @@ class MeetingSummary(Plugin):
             self.log.exception(f"Unexpected error processing meeting log: {e}")
             raise MeetingLogFetchingError(f"❌ Error processing meeting log: {e}")
         self.log.debug(
-            f"Successfully fetched meeting log content ({len(doc_data)} characters)"
+            f"Successfully fetched meeting log content ({len(doc_data)} bytes)"
         )
         return doc_data
 
-    def extract_usernames(self, meeting_log: str) -> list[str]:
+    def extract_usernames(self, meeting_log: bytes) -> list[str]:
         """Extract Matrix usernames from meeting log lines.
 
         Looks for lines like:
         "2025-09-25 08:26:00 <@username:server.tld> Message content"
 
-        Returns a set of unique Matrix usernames found.
+        Returns a sorted list of the unique Matrix usernames found.
         """
-        pattern = r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d <(@[^>]+)> "
-        matches = re.findall(pattern, meeting_log)
-        usernames = set(matches)
-        ignored_ids = [self.client.mxid, self.config["meetbot_id"]] + self.config[
-            "ignored_participants"
-        ]
-        for ignored_id in ignored_ids:
-            with suppress(KeyError):
-                usernames.remove(ignored_id)
-        result = list(sorted(usernames))
+        # Dedupe as we go instead of building the list of all matches
+        matches = {match[1] for match in self._username_re.finditer(meeting_log)}
+        # Only decode the unique matches, not the whole log
+        usernames = {match.decode("utf-8", errors="replace") for match in matches}
+        result = sorted(usernames)
         self.log.info(f"Found {len(result)} unique participants: {result}")
         return result
 
-    async def get_summary(self, meeting_log: str) -> str | None:
-        def _ask_ai() -> GenerateContentResponse:
-            return self.gemini.models.generate_content(
-                model=self.config["gemini"]["model"],
-                contents=[
-                    Part.from_bytes(
-                        data=meeting_log.encode("utf-8"),
-                        mime_type="text/plain",
-                    ),
-                    LLM_PROMPT,
-                ],
+    async def get_summary(self, meeting_log: bytes) -> str | None:
+        # Upload the log with the Files API instead of inlining it as base64
+        # in the request body
+        log_file = await self.gemini.aio.files.upload(
+            file=io.BytesIO(meeting_log),
+            config=UploadFileConfig(mime_type="text/plain"),
+        )
+        try:
+            response = await self.gemini.aio.models.generate_content(
+                model=self._model,
+                contents=[log_file, LLM_PROMPT],
             )
-
-        loop = asyncio.get_running_loop()
-        response: GenerateContentResponse = await loop.run_in_executor(None, _ask_ai)
+        finally:
+            # The summary is regenerated from a fresh upload, don't keep the file
+            if log_file.name is not None:
+                try:
+                    await self.gemini.aio.files.delete(name=log_file.name)
+                except Exception as e:
+                    self.log.warning(
+                        f"Could not delete uploaded file {log_file.name}: {e}"
+                    )
         return response.text
 
     async def post_summary(
@@ -269,17 +319,13 @@ class MeetingSummary(Plugin):
             evt.room_id,
         )
         response_event_id = await evt.respond(
-            RESPONSE_TEMPLATE.format(
-                members=", ".join(usernames),
-                summary=summary,
-            ),
+            f"{_RESPONSE_PREFIX}{', '.join(usernames)}"
+            f"{_RESPONSE_MIDDLE}{summary}{_RESPONSE_SUFFIX}",
             markdown=True,
         )
-        await self.client.react(evt.room_id, response_event_id, "✅")
-        await self.client.react(evt.room_id, response_event_id, "❌")
 
         summary_path = urlparse(url).path
-        summary_path = summary_path[: -len(".log.txt")] + ".summary.md"
+        summary_path = summary_path.removesuffix(".log.txt") + ".summary.md"
         summary_path = summary_path.lstrip("/")
         # Store in cache with 1 day expiry
         cache_key = f"{evt.room_id}:{response_event_id}"
@@ -296,18 +342,22 @@ class MeetingSummary(Plugin):
             ),
             expire="1d",
         )
-        # Store the summary
-        await self._save_summary_to_file(
-            summary,
-            summary_path,
-            validated=False,
+        # Add the reactions and store the summary concurrently
+        await asyncio.gather(
+            self.client.react(evt.room_id, response_event_id, "✅"),
+            self.client.react(evt.room_id, response_event_id, "❌"),
+            self._save_summary_to_file(
+                summary,
+                summary_path,
+                validated=False,
+            ),
         )
 
     async def _save_summary_to_file(
         self, summary: str, path: str, validated: bool = False
     ) -> None:
         """Save the summary to a file in the meetings directory."""
-        if not self.config["meetings_directory"]:
+        if self._meetings_dir is None:
             return  # Disabled
 
         if not validated:
@@ -316,14 +366,18 @@ class MeetingSummary(Plugin):
                 + summary
             )
 
-        meetings_dir = Path(self.config["meetings_directory"])
-        file_path = meetings_dir / path
+        file_path = self._meetings_dir / path
+        # Don't block the event loop on disk IO
+        await asyncio.to_thread(self._write_summary_sync, file_path, summary)
+        self.log.info(f"Saved summary to {file_path}")
+
+    @staticmethod
+    def _write_summary_sync(file_path: Path, summary: str) -> None:
         # Create parent directories if they don't exist
         file_path.parent.mkdir(parents=True, exist_ok=True)
         # Write the summary to the file
         # (even if it already exists, because we always store the unvalidated summary first)
         file_path.write_text(summary)
-        self.log.info(f"Saved summary to {file_path}")
 
     async def repost_summary(self, evt: MessageEvent, cached_data: CachedData) -> None:
         # Edit the message to show we're regenerating